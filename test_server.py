@@ -0,0 +1,390 @@
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import orjson
+import pytest
+import requests
+from youtube_transcript_api import RequestBlocked
+
+import youtube_transcript_server
+from youtube_transcript_server import (
+    AdaptiveRateLimiter,
+    TranscriptCache,
+    YouTubeTranscriptServer,
+    _parse_json_with_orjson
+)
+
+
+class InlineExecutor(ThreadPoolExecutor):
+    """
+    Runs each job as soon as it is submitted, on the submitting thread.
+    """
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+
+@pytest.fixture
+def server():
+    """
+    A server whose transcript downloads are replaced by a fake that sleeps
+    for the time given in server.delays and records every call.
+    """
+    server = YouTubeTranscriptServer()
+    server.delays = {}
+    server.calls = []
+
+    def fake_fetch(video_id, languages):
+        server.calls.append(video_id)
+        time.sleep(server.delays.get(video_id, 0))
+        if video_id == 'blocked':
+            raise RequestBlocked(video_id)
+        return f'transcript of {video_id}'
+
+    server._fetch_transcript = fake_fetch
+    yield server
+    server._pool.shutdown(wait=True)
+
+
+def get_transcript(server, video_id):
+    return server.handle_call_tool({
+        'name': 'get_transcript',
+        'arguments': {'video_id': video_id}
+    })
+
+
+def run(server, coro_fn):
+    async def main():
+        server._rate_limiter = AdaptiveRateLimiter()
+        return await coro_fn()
+    return asyncio.run(main())
+
+
+def transcript_text(result):
+    return orjson.loads(result)['content'][0]['text']
+
+
+def test_cache_evicts_least_recently_used():
+    cache = TranscriptCache(maxsize=2)
+    cache.put(('a', ()), b'a')
+    cache.put(('b', ()), b'b')
+    cache.get(('a', ()))
+    cache.put(('c', ()), b'c')
+
+    assert cache.get(('a', ())) == b'a'
+    assert cache.get(('b', ())) is None
+    assert cache.get(('c', ())) == b'c'
+
+
+def test_cached_transcript_is_not_fetched_again(server):
+    async def main():
+        first = await get_transcript(server, 'abc')
+        second = await get_transcript(server, 'abc')
+        return first, second
+
+    first, second = run(server, main)
+    assert transcript_text(first) == 'transcript of abc'
+    assert second == first
+    assert server.calls == ['abc']
+
+
+def test_cancellation_clears_the_cache(server):
+    async def main():
+        await get_transcript(server, 'abc')
+        server.handle_cancelled({})
+        await get_transcript(server, 'abc')
+
+    run(server, main)
+    assert server.calls == ['abc', 'abc']
+
+
+def test_response_json_is_parsed_with_orjson():
+    response = requests.Response()
+    response._content = '{"text": "héllo", "n": [1, 2.5]}'.encode()
+    _parse_json_with_orjson(response)
+    assert response.json() == {'text': 'héllo', 'n': [1, 2.5]}
+
+    response._content = b'<html>'
+    with pytest.raises(requests.exceptions.JSONDecodeError):
+        response.json()
+
+
+def test_throttled_responses_are_not_retried(server):
+    retry = server._http.get_adapter('https://www.youtube.com/').max_retries
+    assert not retry.is_retry('GET', 429, has_retry_after=True)
+    assert not retry.is_retry('GET', 503, has_retry_after=True)
+    assert retry.total == 3
+
+
+def test_concurrent_requests_share_one_fetch(server):
+    server.delays['abc'] = 0.1
+
+    async def main():
+        return await asyncio.gather(*(get_transcript(server, 'abc') for _ in range(5)))
+
+    results = run(server, main)
+    assert server.calls == ['abc']
+    assert all(result == results[0] for result in results)
+    assert server._in_flight == {}
+
+
+def test_fast_fetch_is_not_held_back_by_slow_one(server):
+    server.delays['slow'] = 0.5
+    finished = {}
+
+    async def timed(video_id):
+        start = time.monotonic()
+        await get_transcript(server, video_id)
+        finished[video_id] = time.monotonic() - start
+
+    async def main():
+        await asyncio.gather(timed('slow'), timed('fast'))
+
+    run(server, main)
+    assert finished['fast'] < finished['slow']
+    assert finished['slow'] >= 0.5
+
+
+def test_lone_request_is_fetched_without_waiting_for_a_timer(server):
+    server._pool.shutdown(wait=True)
+    server._pool = InlineExecutor()
+
+    async def main():
+        task = asyncio.create_task(get_transcript(server, 'abc'))
+        # Zero-length sleeps let ready callbacks run but no timer expire
+        for _ in range(3):
+            await asyncio.sleep(0)
+        calls = list(server.calls)
+        await task
+        return calls
+
+    assert run(server, main) == ['abc']
+
+
+def test_fetch_error_is_returned_to_every_waiter(server):
+    server.delays['blocked'] = 0.05
+
+    async def main():
+        return await asyncio.gather(*(get_transcript(server, 'blocked') for _ in range(2)))
+
+    results = run(server, main)
+    assert server.calls == ['blocked']
+    for result in results:
+        assert result['error']['code'] == -32000
+    assert server._transcript_cache.get(('blocked', ())) is None
+
+
+def test_rate_limit_error_slows_the_limiter_down(server):
+    async def main():
+        interval = server._rate_limiter.interval
+        await get_transcript(server, 'blocked')
+        return interval, server._rate_limiter.interval
+
+    before, after = run(server, main)
+    assert after == pytest.approx(before * youtube_transcript_server.BACKOFF_FACTOR)
+
+
+def completes_without_waiting(coro):
+    """
+    Step a coroutine once and report whether it finished without suspending.
+    """
+    try:
+        coro.send(None)
+    except StopIteration:
+        return True
+    coro.close()
+    return False
+
+
+def test_limiter_backs_off_and_recovers_within_bounds():
+    async def main():
+        limiter = AdaptiveRateLimiter(
+            initial_rate=20, min_rate=10, max_rate=30,
+            backoff_factor=2, recovery_factor=0.5, max_consecutive_failures=10
+        )
+        intervals = [limiter.interval]
+        for _ in range(3):
+            limiter.record_failure()
+            intervals.append(limiter.interval)
+        for _ in range(3):
+            limiter.record_success()
+            intervals.append(limiter.interval)
+        return intervals
+
+    assert asyncio.run(main()) == pytest.approx([3, 6, 6, 6, 3, 2, 2])
+
+
+def test_limiter_pauses_after_consecutive_failures():
+    async def main():
+        limiter = AdaptiveRateLimiter(initial_rate=60, max_consecutive_failures=2)
+        limiter.record_failure()
+        unpaused = completes_without_waiting(limiter.acquire())
+
+        limiter.record_failure()
+        paused = completes_without_waiting(limiter.acquire())
+        pause = limiter._paused_until - asyncio.get_running_loop().time()
+        return unpaused, paused, pause, limiter.interval
+
+    unpaused, paused, pause, interval = asyncio.run(main())
+    assert unpaused
+    assert not paused
+    assert pause == pytest.approx(interval, abs=0.5)
+
+
+def test_limiter_releases_tokens_at_the_interval():
+    async def main():
+        limiter = AdaptiveRateLimiter(initial_rate=1, max_rate=600)
+        limiter.interval = 0.05
+        refill = asyncio.create_task(limiter.refill())
+        await limiter.acquire()
+        start = time.monotonic()
+        await limiter.acquire()
+        refill.cancel()
+        return time.monotonic() - start
+
+    assert 0.03 < asyncio.run(main()) < 0.5
+
+
+def test_unknown_logging_level_falls_back_to_debug():
+    server_path = os.path.join(os.path.dirname(__file__), 'youtube_transcript_server.py')
+    completed = subprocess.run(
+        [sys.executable, server_path],
+        input=b'{"jsonrpc": "2.0", "id": 1, "method": "tools/list"}\n',
+        capture_output=True,
+        env={**os.environ, 'LOGGING_LEVEL': 'verbose'},
+        timeout=60
+    )
+    assert completed.returncode == 0
+    assert b'Unknown LOGGING_LEVEL: VERBOSE, using DEBUG' in completed.stderr
+    assert b'"id":1' in completed.stdout
+
+
+@pytest.fixture
+def ytdlp_server(monkeypatch):
+    """
+    A server using the yt-dlp backend, with a fake extractor that finds an
+    English json3 track for every video, or raises server.ytdlp_error.
+    """
+    yt_dlp = pytest.importorskip('yt_dlp')
+    monkeypatch.setattr(youtube_transcript_server, 'TRANSCRIPT_BACKEND', 'ytdlp')
+    monkeypatch.setattr(youtube_transcript_server, 'yt_dlp', yt_dlp, raising=False)
+
+    server = YouTubeTranscriptServer()
+    server.ytdlp_error = None
+
+    class FakeYoutubeDL:
+        def __init__(self, options):
+            pass
+
+        def extract_info(self, url, download):
+            if server.ytdlp_error is not None:
+                raise server.ytdlp_error
+            return {'subtitles': {'en': [{'ext': 'json3', 'url': 'https://captions/en'}]}}
+
+    monkeypatch.setattr(yt_dlp, 'YoutubeDL', FakeYoutubeDL)
+    yield server
+    server._pool.shutdown(wait=True)
+
+
+def test_ytdlp_caption_429_slows_the_limiter_down(ytdlp_server):
+    def fake_get(url, timeout):
+        response = requests.Response()
+        response.status_code = 429
+        response.url = url
+        return response
+
+    ytdlp_server._http.get = fake_get
+
+    async def main():
+        interval = ytdlp_server._rate_limiter.interval
+        result = await get_transcript(ytdlp_server, 'abc')
+        return result, interval, ytdlp_server._rate_limiter.interval
+
+    result, before, after = run(ytdlp_server, main)
+    assert 'blocking requests' in result['error']['message']
+    assert after == pytest.approx(before * youtube_transcript_server.BACKOFF_FACTOR)
+
+
+@pytest.mark.parametrize('message, throttled', [
+    ('ERROR: [youtube] abc: HTTP Error 429: Too Many Requests', True),
+    ("ERROR: [youtube] abc: Sign in to confirm you’re not a bot", True),
+    ('ERROR: [youtube] abc: Video unavailable', False),
+])
+def test_ytdlp_throttling_is_reported_as_request_blocked(ytdlp_server, message, throttled):
+    download_error = youtube_transcript_server.yt_dlp.utils.DownloadError
+    ytdlp_server.ytdlp_error = download_error(message)
+
+    with pytest.raises(RequestBlocked if throttled else download_error):
+        ytdlp_server._fetch_transcript('abc', ())
+
+
+def handle(server, message):
+    """
+    Pass one message line to the server and return the decoded responses.
+    """
+    read_fd, write_fd = os.pipe()
+    server._stdout_fd = write_fd
+    try:
+        asyncio.run(server.handle_message(message))
+    finally:
+        os.close(write_fd)
+    with os.fdopen(read_fd, 'rb') as responses:
+        return [orjson.loads(line) for line in responses]
+
+
+def test_invalid_json_gets_a_parse_error(server):
+    [response] = handle(server, b'{"jsonrpc": "2.0", "id": 1,\n')
+    assert response['id'] is None
+    assert response['error']['code'] == -32700
+
+
+def test_message_that_is_not_an_object_is_an_invalid_request(server):
+    [response] = handle(server, b'[1, 2, 3]\n')
+    assert response['id'] is None
+    assert response['error']['code'] == -32600
+
+
+def test_unknown_method_is_reported(server):
+    [response] = handle(server, b'{"jsonrpc": "2.0", "id": 7, "method": "ping"}\n')
+    assert response == {
+        'jsonrpc': '2.0',
+        'id': 7,
+        'error': {'code': -32601, 'message': 'Unknown method: ping'}
+    }
+
+
+def test_pre_encoded_result_is_spliced_into_the_envelope(server):
+    server._transcript_cache.put(('abc', ()), b'{"content":[{"type":"text","text":"cached"}]}')
+    message = orjson.dumps({
+        'jsonrpc': '2.0',
+        'id': 'req-1',
+        'method': 'tools/call',
+        'params': {'name': 'get_transcript', 'arguments': {'video_id': 'abc'}}
+    })
+
+    [response] = handle(server, message)
+    assert response == {
+        'jsonrpc': '2.0',
+        'id': 'req-1',
+        'result': {'content': [{'type': 'text', 'text': 'cached'}]}
+    }
+    assert server.calls == []
+
+
+def test_tools_list_is_sent_from_its_encoded_form(server):
+    [response] = handle(server, b'{"jsonrpc": "2.0", "id": 2, "method": "tools/list"}')
+    assert response['id'] == 2
+    assert response['result'] == youtube_transcript_server._TOOLS_LIST_RESULT
+
+
+def test_notification_gets_no_response(server):
+    assert handle(server, b'{"jsonrpc": "2.0", "method": "notifications/initialized"}\n') == []
@@ -1,4 +1,5 @@
 import logging
+import sys
 from youtube_transcript_api import YouTubeTranscriptApi
 
 # Set up logging
@@ -7,9 +8,10 @@ logger = logging.getLogger(__name__)
 
 try:
     logger.info("Attempting to fetch transcript...")
-    transcript = YouTubeTranscriptApi.get_transcript('usOmwLZNVuM', languages=['en'])
+    transcript = YouTubeTranscriptApi().fetch('usOmwLZNVuM', languages=['en'])
     logger.info(f"Successfully retrieved transcript with {len(transcript)} entries")
-    for entry in transcript:
-        print(f"{entry['text']}")
+    # Write the whole transcript at once instead of one print per entry
+    sys.stdout.write('\n'.join([entry.text for entry in transcript.snippets]))
+    sys.stdout.write('\n')
 except Exception as e:
     logger.error(f"Failed to get transcript: {str(e)}", exc_info=True)
@@ -6,31 +6,292 @@ A simple MCP server that listens on stdin for requests to fetch YouTube
 video transcripts using the youtube_transcript_api library.
 """
 
-import json
+import asyncio
+import inspect
 import sys
 import logging
 import os
-from typing import Dict, Any
-
-# Disable output buffering
-os.environ['PYTHONUNBUFFERED'] = '1'
-
-# Configure logging
+import select
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional, Tuple, Union
+
+# stdout carries the JSON-RPC stream and nothing else. Keep the real stream
+# for responses and point sys.stdout at stderr, so stray prints from this
+# process or any library it imports cannot corrupt the protocol.
+_real_stdout = sys.stdout
+sys.stdout = sys.stderr
+
+# Configure logging, replacing any handlers a library may have installed.
+# An unknown LOGGING_LEVEL falls back to DEBUG instead of failing at startup.
+LOGGING_LEVEL = os.environ.get('LOGGING_LEVEL', 'DEBUG').upper()
+_level = logging.getLevelName(LOGGING_LEVEL)
 logging.basicConfig(
-    level=logging.DEBUG,
+    level=_level if isinstance(_level, int) else logging.DEBUG,
     format='%(asctime)s - %(levelname)s - %(message)s',
-    stream=sys.stderr
+    stream=sys.stderr,
+    force=True
 )
-
-logging.info(f"Python Path: {sys.path}")
+logger = logging.getLogger(__name__)
+if not isinstance(_level, int):
+    logger.warning(f"Unknown LOGGING_LEVEL: {LOGGING_LEVEL}, using DEBUG")
 
 try:
-    from youtube_transcript_api import YouTubeTranscriptApi
+    import orjson
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3 import Retry
+    from youtube_transcript_api import (
+        RequestBlocked,
+        TranscriptsDisabled,
+        YouTubeTranscriptApi
+    )
 except ImportError as e:
-    logging.error(f"Failed to import youtube_transcript_api: {str(e)}")
-    logging.error("Please install using: uv pip install youtube-transcript-api")
+    logger.error(f"Failed to import dependencies: {str(e)}")
+    logger.error("Please install using: uv pip install -r requirements.txt")
     sys.exit(1)
 
+# Where transcripts come from: 'api' uses youtube_transcript_api, 'ytdlp'
+# reads the subtitle tracks yt-dlp extracts, in a single caption download
+TRANSCRIPT_BACKEND = os.environ.get('TRANSCRIPT_BACKEND', 'api').lower()
+
+if TRANSCRIPT_BACKEND == 'ytdlp':
+    try:
+        import yt_dlp
+    except ImportError as e:
+        logger.error(f"Failed to import yt_dlp: {str(e)}")
+        logger.error("Please install using: uv pip install yt-dlp")
+        sys.exit(1)
+elif TRANSCRIPT_BACKEND != 'api':
+    logger.error(f"Unknown TRANSCRIPT_BACKEND: {TRANSCRIPT_BACKEND} (expected 'api' or 'ytdlp')")
+    sys.exit(1)
+
+# Options for the yt-dlp extractor: metadata only, nothing on stdout
+YTDLP_OPTIONS = {
+    'skip_download': True,
+    'quiet': True,
+    'no_warnings': True,
+    'logger': logger
+}
+
+# Lowercase fragments of yt-dlp errors that mean YouTube is throttling us:
+# an HTTP 429, or the sign-in page asking to confirm we are not a bot
+YTDLP_THROTTLE_MARKERS = ('http error 429', 'not a bot')
+
+# Number of worker threads downloading transcripts at the same time
+FETCH_WORKERS = int(os.environ.get('FETCH_WORKERS', '8'))
+
+# Longest excerpt of a message or response written to the debug log
+LOG_PREVIEW_SIZE = 256
+
+# Number of formatted transcripts kept in memory
+TRANSCRIPT_CACHE_SIZE = int(os.environ.get('TRANSCRIPT_CACHE_SIZE', '512'))
+
+# Pacing of requests to YouTube, in requests per minute. The rate backs off
+# by BACKOFF_FACTOR whenever YouTube pushes back and recovers by
+# RECOVERY_FACTOR on every success.
+INITIAL_RATE = float(os.environ.get('INITIAL_RATE', '20'))
+MIN_RATE = float(os.environ.get('MIN_RATE', '5'))
+MAX_RATE = float(os.environ.get('MAX_RATE', '30'))
+BACKOFF_FACTOR = float(os.environ.get('BACKOFF_FACTOR', '1.5'))
+RECOVERY_FACTOR = float(os.environ.get('RECOVERY_FACTOR', '0.8'))
+# Failures in a row after which new requests are held for a full interval
+MAX_CONSECUTIVE_FAILURES = int(os.environ.get('MAX_CONSECUTIVE_FAILURES', '3'))
+
+# Errors that mean YouTube is throttling us. It also reports captions as
+# disabled, for videos that do have them, to clients it is rate limiting.
+RATE_LIMIT_ERRORS = (RequestBlocked, TranscriptsDisabled)
+
+# The 'tools/list' result never changes, so it is built and encoded once
+_TOOLS_LIST_RESULT: Dict[str, Any] = {
+    'tools': [
+        {
+            'name': 'get_transcript',
+            'description': 'Get transcript for a YouTube video',
+            'inputSchema': {
+                'type': 'object',
+                'properties': {
+                    'video_id': {
+                        'type': 'string',
+                        'description': (
+                            'YouTube video ID (e.g., dQw4w9WgXcQ '
+                            'from youtube.com/watch?v=dQw4w9WgXcQ)'
+                        )
+                    },
+                    'languages': {
+                        'type': 'array',
+                        'items': {'type': 'string'},
+                        'description': (
+                            'List of language codes to try '
+                            '(e.g., ["en"]). Optional.'
+                        )
+                    }
+                },
+                'required': ['video_id']
+            }
+        }
+    ]
+}
+_TOOLS_LIST_JSON = orjson.dumps(_TOOLS_LIST_RESULT)
+
+# Results of the resource listings, which are always empty
+_RESOURCES_LIST_JSON = b'{"resources":[]}'
+_RESOURCE_TEMPLATES_LIST_JSON = b'{"resourceTemplates":[]}'
+
+# JSON-RPC envelopes, filled in with the encoded request id and the encoded
+# result or error object
+_RESULT_TEMPLATE = b'{"jsonrpc":"2.0","id":%b,"result":%b}\n'
+_ERROR_TEMPLATE = b'{"jsonrpc":"2.0","id":%b,"error":%b}\n'
+
+# Cache key: the video ID and the requested language codes, in order
+CacheKey = Tuple[str, Tuple[str, ...]]
+
+
+class TranscriptCache:
+    """
+    A least-recently-used cache of transcript results, stored already
+    encoded as JSON so a hit is written out without any work. Transcripts do
+    not change over the course of a session, so repeated requests for the
+    same video can be answered without going back to YouTube.
+    """
+
+    def __init__(self, maxsize: int = TRANSCRIPT_CACHE_SIZE) -> None:
+        """
+        Create an empty cache.
+
+        :param maxsize: The maximum number of transcripts to keep.
+        """
+        self.maxsize = maxsize
+        self._entries: 'OrderedDict[CacheKey, bytes]' = OrderedDict()
+
+    def get(self, key: CacheKey) -> Optional[bytes]:
+        """
+        Look up a transcript and mark it as recently used.
+
+        :param key: The (video_id, languages) cache key.
+        :return: The cached, JSON-encoded result, or None on a miss.
+        """
+        result = self._entries.get(key)
+        if result is not None:
+            self._entries.move_to_end(key)
+        return result
+
+    def put(self, key: CacheKey, result: bytes) -> None:
+        """
+        Store a transcript, evicting the least recently used one if full.
+
+        :param key: The (video_id, languages) cache key.
+        :param result: The JSON-encoded 'tools/call' result.
+        :return: None
+        """
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """
+        Remove all cached transcripts.
+
+        :return: None
+        """
+        self._entries.clear()
+
+
+class AdaptiveRateLimiter:
+    """
+    A token bucket that paces requests to YouTube. Up to initial_rate
+    requests may go out at once, after which a token is added back every
+    interval seconds. The interval grows when YouTube starts rejecting
+    requests and shrinks again while they succeed, within the bounds set by
+    min_rate and max_rate. Must be created inside the running event loop.
+    """
+
+    def __init__(
+        self,
+        initial_rate: float = INITIAL_RATE,
+        min_rate: float = MIN_RATE,
+        max_rate: float = MAX_RATE,
+        backoff_factor: float = BACKOFF_FACTOR,
+        recovery_factor: float = RECOVERY_FACTOR,
+        max_consecutive_failures: int = MAX_CONSECUTIVE_FAILURES
+    ) -> None:
+        """
+        Create a limiter with a full bucket.
+
+        :param initial_rate: Starting rate and bucket size, in requests per minute.
+        :param min_rate: Slowest rate to back off to, in requests per minute.
+        :param max_rate: Fastest rate to recover to, in requests per minute.
+        :param backoff_factor: Interval multiplier applied on each failure.
+        :param recovery_factor: Interval multiplier applied on each success.
+        :param max_consecutive_failures: Failures in a row after which new
+                                         requests are held for one interval.
+        """
+        self.capacity = max(1, int(initial_rate))
+        self.min_interval = 60 / max_rate
+        self.max_interval = 60 / min_rate
+        self.interval = min(max(60 / initial_rate, self.min_interval), self.max_interval)
+        self.backoff_factor = backoff_factor
+        self.recovery_factor = recovery_factor
+        self.max_consecutive_failures = max_consecutive_failures
+
+        self._tokens = asyncio.Semaphore(self.capacity)
+        self._available = self.capacity
+        self._consecutive_failures = 0
+        self._paused_until = 0.0
+
+    async def acquire(self) -> None:
+        """
+        Wait until a request may be sent to YouTube.
+
+        :return: None
+        """
+        await self._tokens.acquire()
+        self._available -= 1
+
+        delay = self._paused_until - asyncio.get_running_loop().time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def refill(self) -> None:
+        """
+        Add a token back to the bucket every interval seconds. Runs until
+        cancelled.
+
+        :return: None
+        """
+        while True:
+            await asyncio.sleep(self.interval)
+            if self._available < self.capacity:
+                self._available += 1
+                self._tokens.release()
+
+    def record_success(self) -> None:
+        """
+        Speed back up after a request went through.
+
+        :return: None
+        """
+        self._consecutive_failures = 0
+        self.interval = max(self.interval * self.recovery_factor, self.min_interval)
+
+    def record_failure(self) -> None:
+        """
+        Slow down after YouTube rejected a request, and hold new requests
+        for an interval once it has done so several times in a row.
+
+        :return: None
+        """
+        self._consecutive_failures += 1
+        self.interval = min(self.interval * self.backoff_factor, self.max_interval)
+        logger.warning(f"YouTube is rate limiting requests, interval is now {self.interval:.1f}s")
+
+        if self._consecutive_failures >= self.max_consecutive_failures:
+            self._paused_until = asyncio.get_running_loop().time() + self.interval
+
+
 class YouTubeTranscriptServer:
     """
     A simple MCP server that provides a tool to retrieve YouTube video
@@ -38,20 +299,58 @@ class YouTubeTranscriptServer:
     messages on stdin and writes responses to stdout.
     """
 
+    # Map MCP methods to the names of their handler methods. Built once for
+    # the class so dispatching a message takes a single lookup.
+    _HANDLERS: Mapping[str, str] = MappingProxyType({
+        'initialize': 'handle_initialize',
+        'tools/list': 'handle_list_tools',
+        'tools/call': 'handle_call_tool',
+        'resources/list': 'handle_list_resources',
+        'resources/templates/list': 'handle_list_resource_templates',
+        'notifications/initialized': 'handle_notification',
+        'cancelled': 'handle_cancelled'
+    })
+
     def __init__(self) -> None:
         """
-        Initialize the server and map MCP methods to their corresponding
-        handler functions.
-        """
-        self.handlers = {
-            'initialize': self.handle_initialize,
-            'tools/list': self.handle_list_tools,
-            'tools/call': self.handle_call_tool,
-            'resources/list': self.handle_list_resources,
-            'resources/templates/list': self.handle_list_resource_templates,
-            'notifications/initialized': self.handle_notification,
-            'cancelled': self.handle_cancelled
-        }
+        Initialize the server state.
+        """
+        self._transcript_cache = TranscriptCache()
+
+        # Downloads in progress, shared by every request for the same
+        # transcript, and the limiter pacing them. The limiter is created by
+        # _run once the event loop is running.
+        self._in_flight: Dict[CacheKey, asyncio.Task] = {}
+        self._rate_limiter: Optional[AdaptiveRateLimiter] = None
+
+        # One HTTP session for the lifetime of the process, so keep-alive
+        # connections to YouTube are reused across requests. Only connection
+        # errors are retried here; a 429 is passed straight back so that the
+        # rate limiter sees it instead of a worker sleeping on Retry-After
+        self._http = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=Retry(
+                total=3, status=0, backoff_factor=0.5, respect_retry_after_header=False
+            )
+        )
+        self._http.mount('https://', adapter)
+        self._http.mount('http://', adapter)
+        self._http.hooks['response'].append(_parse_json_with_orjson)
+        self._api = YouTubeTranscriptApi(http_client=self._http)
+
+        # Blocking transcript downloads run on these threads, so the event
+        # loop keeps reading stdin while they wait on the network
+        self._pool = ThreadPoolExecutor(
+            max_workers=FETCH_WORKERS, thread_name_prefix='transcript-fetch'
+        )
+
+        # yt-dlp extractors are reused, one per worker thread
+        self._ytdlp = threading.local()
+
+        # File descriptor responses are written to
+        self._stdout_fd = _real_stdout.fileno()
 
     def handle_initialize(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -93,86 +392,68 @@ class YouTubeTranscriptServer:
         :param params: JSON parameters from the client.
         :return: None
         """
-        logging.debug(f"Received notification with params: {params}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Received notification with params: %.*s", LOG_PREVIEW_SIZE, params)
         return None
 
     def handle_cancelled(self, params: Dict[str, Any]) -> None:
         """
-        Handle cancellation notifications.
+        Handle cancellation notifications. Cached transcripts are dropped so
+        that a client retrying after a cancellation gets a fresh copy.
 
         :param params: JSON parameters from the client.
         :return: None
         """
-        logging.debug(f"Received cancellation with params: {params}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Received cancellation with params: %.*s", LOG_PREVIEW_SIZE, params)
+        self._transcript_cache.clear()
         return None
 
-    def handle_list_resources(self, params: Dict[str, Any]) -> Dict[str, Any]:
+    def handle_list_resources(self, params: Dict[str, Any]) -> bytes:
         """
         Handle the 'resources/list' RPC method.
 
         :param params: JSON parameters from the client.
-        :return: An empty list of resources (as an example).
+        :return: An empty list of resources (as an example), already encoded
+                 as JSON.
         """
-        return {'resources': []}
+        return _RESOURCES_LIST_JSON
 
-    def handle_list_resource_templates(self, params: Dict[str, Any]) -> Dict[str, Any]:
+    def handle_list_resource_templates(self, params: Dict[str, Any]) -> bytes:
         """
         Handle the 'resources/templates/list' RPC method.
 
         :param params: JSON parameters from the client.
-        :return: An empty list of resource templates (as an example).
+        :return: An empty list of resource templates (as an example), already
+                 encoded as JSON.
         """
-        return {'resourceTemplates': []}
+        return _RESOURCE_TEMPLATES_LIST_JSON
 
-    def handle_list_tools(self, params: Dict[str, Any]) -> Dict[str, Any]:
+    def handle_list_tools(self, params: Dict[str, Any]) -> bytes:
         """
         Handle the 'tools/list' RPC method.
 
         :param params: JSON parameters from the client.
-        :return: A list of available tools (in this case, just 'get_transcript').
+        :return: A list of available tools (in this case, just 'get_transcript'),
+                 already encoded as JSON.
         """
-        return {
-            'tools': [
-                {
-                    'name': 'get_transcript',
-                    'description': 'Get transcript for a YouTube video',
-                    'inputSchema': {
-                        'type': 'object',
-                        'properties': {
-                            'video_id': {
-                                'type': 'string',
-                                'description': (
-                                    'YouTube video ID (e.g., dQw4w9WgXcQ '
-                                    'from youtube.com/watch?v=dQw4w9WgXcQ)'
-                                )
-                            },
-                            'languages': {
-                                'type': 'array',
-                                'items': {'type': 'string'},
-                                'description': (
-                                    'List of language codes to try '
-                                    '(e.g., ["en"]). Optional.'
-                                )
-                            }
-                        },
-                        'required': ['video_id']
-                    }
-                }
-            ]
-        }
+        return _TOOLS_LIST_JSON
 
-    def handle_call_tool(self, params: Dict[str, Any]) -> Dict[str, Any]:
+    async def handle_call_tool(self, params: Dict[str, Any]) -> Union[bytes, Dict[str, Any]]:
         """
         Handle the 'tools/call' RPC method. Currently supports only the 
-        'get_transcript' tool.
+        'get_transcript' tool. Transcripts that are not cached are
+        downloaded in the background, so other messages keep being served
+        while they wait.
 
         :param params: JSON parameters from the client. Should contain 'name'
                        of the tool and 'arguments' for the tool.
-        :return: The transcript data or an error if the tool or operation fails.
+        :return: The transcript data, already encoded as JSON, or an error if
+                 the tool or operation fails.
         """
         tool_name = params.get('name')
         if tool_name != 'get_transcript':
-            logging.error(f"Unknown tool: {tool_name}")
+            logger.error(f"Unknown tool: {tool_name}")
             return {
                 'error': {
                     'code': -32601,  # Method not found
@@ -185,31 +466,23 @@ class YouTubeTranscriptServer:
             video_id = args['video_id']
             languages = args.get('languages')
 
-            logging.info(f"Fetching transcript for video {video_id}")
-            
-            # Retrieve the transcript
-            if languages:
-                transcript = YouTubeTranscriptApi.get_transcript(video_id, languages=languages)
-            else:
-                transcript = YouTubeTranscriptApi.get_transcript(video_id)
+            cache_key = (video_id, tuple(languages or ()))
+            result = self._transcript_cache.get(cache_key)
 
-            # Format transcript
-            formatted_transcript = [entry['text'] for entry in transcript]
-            result = '\n'.join(formatted_transcript)
+            if result is not None:
+                logger.info(f"Using cached transcript for video {video_id}")
+            else:
+                logger.info(f"Fetching transcript for video {video_id}")
+                result = await self._get_transcript_result(cache_key)
 
-            logging.info(f"Successfully formatted transcript, length: {len(result)}")
-            return {
-                'content': [
-                    {
-                        'type': 'text',
-                        'text': result
-                    }
-                ]
-            }
+            return result
 
         except Exception as e:
             error_msg = f'Error getting transcript: {str(e)}'
-            logging.error(error_msg, exc_info=True)
+            # Failures can come in bursts, so keep this to one line and only
+            # pay for formatting the traceback when debug logging is on
+            logger.warning(f"{error_msg} ({type(e).__name__})")
+            logger.debug("Transcript error traceback", exc_info=True)
             return {
                 'error': {
                     'code': -32000,  # Server error
@@ -217,69 +490,382 @@ class YouTubeTranscriptServer:
                 }
             }
 
-    def handle_message(self, message: str) -> None:
+    async def _get_transcript_result(self, cache_key: CacheKey) -> bytes:
+        """
+        Wait for a transcript to download. Requests for a transcript that is
+        already being fetched join that download instead of starting another,
+        and each one gets its result as soon as its own download completes.
+
+        :param cache_key: The (video_id, languages) of the transcript.
+        :return: The JSON-encoded result with the transcript as text content.
+        """
+        task = self._in_flight.get(cache_key)
+        if task is None:
+            task = asyncio.create_task(self._fetch_transcript_result(cache_key))
+            self._in_flight[cache_key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(cache_key, None))
+        else:
+            logger.debug("Joining in-flight fetch for video %s", cache_key[0])
+
+        # Shielded, so one waiter being cancelled does not abort the download
+        # for the others
+        return await asyncio.shield(task)
+
+    async def _fetch_transcript_result(self, cache_key: CacheKey) -> bytes:
+        """
+        Fetch a transcript in a worker thread, encode it as the 'tools/call'
+        result and add it to the cache.
+
+        :param cache_key: The (video_id, languages) of the transcript.
+        :return: The JSON-encoded result with the transcript as text content.
+        """
+        video_id, languages = cache_key
+
+        # Retrieve the transcript without blocking the event loop
+        await self._rate_limiter.acquire()
+        loop = asyncio.get_running_loop()
+        try:
+            text = await loop.run_in_executor(
+                self._pool, self._fetch_transcript, video_id, languages
+            )
+        except RATE_LIMIT_ERRORS:
+            self._rate_limiter.record_failure()
+            raise
+        self._rate_limiter.record_success()
+
+        # Encode the text straight to JSON bytes once; every response for
+        # this transcript, cached or not, splices in the same bytes
+        result = orjson.dumps({
+            'content': [
+                {
+                    'type': 'text',
+                    'text': text
+                }
+            ]
+        })
+        self._transcript_cache.put(cache_key, result)
+
+        logger.info(f"Successfully formatted transcript, length: {len(text)}")
+        return result
+
+    def _fetch_transcript(self, video_id: str, languages: Tuple[str, ...]) -> str:
+        """
+        Download a transcript from YouTube over the shared HTTP session, using
+        the configured TRANSCRIPT_BACKEND. This blocks on network I/O and is
+        meant to be run in a worker thread.
+
+        :param video_id: The YouTube video ID.
+        :param languages: Language codes to try, in order of preference.
+        :return: The transcript text, one snippet per line.
+        """
+        if TRANSCRIPT_BACKEND == 'ytdlp':
+            return self._fetch_transcript_ytdlp(video_id, languages)
+
+        if languages:
+            transcript = self._api.fetch(video_id, languages=languages)
+        else:
+            transcript = self._api.fetch(video_id)
+
+        # Format transcript in a single join over the snippet list
+        return '\n'.join([snippet.text for snippet in transcript.snippets])
+
+    def _get_ytdlp_extractor(self) -> 'yt_dlp.YoutubeDL':
+        """
+        Get the yt-dlp extractor of the calling worker thread, creating it on
+        first use.
+
+        :return: The thread's YoutubeDL instance.
+        """
+        extractor = getattr(self._ytdlp, 'extractor', None)
+        if extractor is None:
+            extractor = self._ytdlp.extractor = yt_dlp.YoutubeDL(YTDLP_OPTIONS)
+        return extractor
+
+    def _fetch_transcript_ytdlp(self, video_id: str, languages: Tuple[str, ...]) -> str:
+        """
+        Download a transcript using the subtitle tracks found by yt-dlp. The
+        chosen track is read in YouTube's json3 format with a single request.
+
+        :param video_id: The YouTube video ID.
+        :param languages: Language codes to try, in order of preference.
+        :return: The transcript text, one caption event per line.
+        """
+        try:
+            info = self._get_ytdlp_extractor().extract_info(
+                f'https://www.youtube.com/watch?v={video_id}', download=False
+            )
+        except yt_dlp.utils.DownloadError as e:
+            # Reported like the api backend does, so the rate limiter backs off
+            if any(marker in str(e).lower() for marker in YTDLP_THROTTLE_MARKERS):
+                raise RequestBlocked(video_id) from e
+            raise
+
+        languages = languages or ('en',)
+        url = _find_caption_url(info, languages)
+        if url is None:
+            raise ValueError(
+                f"No transcript found for video {video_id} in languages {list(languages)}"
+            )
+
+        response = self._http.get(url, timeout=30)
+        if response.status_code == 429:
+            raise RequestBlocked(video_id)
+        response.raise_for_status()
+
+        lines = []
+        for event in response.json().get('events', []):
+            text = ''.join(seg.get('utf8', '') for seg in event.get('segs', ())).strip()
+            if text:
+                lines.append(text)
+        return '\n'.join(lines)
+
+    async def handle_message(self, message: bytes) -> None:
         """
         Parse and handle a single MCP message.
 
-        :param message: A JSON-encoded string representing the RPC request.
+        :param message: The raw UTF-8 JSON bytes of one RPC request line,
+                        optionally still ending in its line terminator.
         :return: None
         """
+        request_id = None
         try:
-            logging.debug(f"Received message: {message}")
-            request = json.loads(message)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Received message: %s",
+                    message[:LOG_PREVIEW_SIZE].decode('utf-8', 'replace').rstrip()
+                )
+
+            try:
+                request = orjson.loads(message)
+            except orjson.JSONDecodeError as e:
+                logger.warning(f"Could not parse message: {str(e)}")
+                self._send_error(None, {
+                    'code': -32700,  # Parse error
+                    'message': f'Parse error: {str(e)}'
+                })
+                return
+
+            if not isinstance(request, dict):
+                logger.warning("Received a message that is not a JSON object")
+                self._send_error(None, {
+                    'code': -32600,  # Invalid request
+                    'message': 'Invalid request: expected a JSON object'
+                })
+                return
+
+            request_id = request.get('id')
             method = request.get('method')
-            logging.debug(f"Processing method: {method}")
-
-            if method not in self.handlers:
-                response = {
-                    'jsonrpc': '2.0',
-                    'id': request.get('id'),
-                    'error': {
-                        'code': -32601,  # Method not found
-                        'message': f'Unknown method: {method}'
-                    }
-                }
-            else:
-                result = self.handlers[method](request.get('params', {}))
-                
-                # For notifications or other handlers returning None, do not send a response
-                if result is None:
-                    return
-
-                response = {
-                    'jsonrpc': '2.0',
-                    'id': request.get('id'),
-                    'result': result
-                }
+            logger.debug("Processing method: %s", method)
+
+            handler = self._HANDLERS.get(method)
+            if handler is None:
+                self._send_error(request_id, {
+                    'code': -32601,  # Method not found
+                    'message': f'Unknown method: {method}'
+                })
+                return
+
+            result = getattr(self, handler)(request.get('params', {}))
 
-            logging.debug(f"Sending response: {response}")
-            print(json.dumps(response), flush=True)
+            # For notifications or other handlers returning None, do not send a response
+            if result is None:
+                return
+
+            if inspect.isawaitable(result):
+                result = await result
+
+            # Pre-encoded results are spliced into the envelope as is, anything
+            # else is encoded on its own first
+            if not isinstance(result, bytes):
+                result = orjson.dumps(result)
+            self._send(_RESULT_TEMPLATE % (orjson.dumps(request_id), result))
 
         except Exception as e:
-            logging.error(f"Error handling message: {str(e)}", exc_info=True)
-            error_response = {
-                'jsonrpc': '2.0',
-                'id': request.get('id'),
-                'error': {
-                    'code': -32603,  # Internal error
-                    'message': str(e)
-                }
-            }
-            print(json.dumps(error_response), flush=True)
+            # Logged like transcript failures: one line, with the traceback
+            # only formatted when debug logging is on
+            logger.warning(f"Error handling message: {str(e)} ({type(e).__name__})")
+            logger.debug("Message error traceback", exc_info=True)
+            self._send_error(request_id, {
+                'code': -32603,  # Internal error
+                'message': str(e)
+            })
+
+    def _send_error(self, request_id: Any, error: Dict[str, Any]) -> None:
+        """
+        Send a JSON-RPC error response.
+
+        :param request_id: The id of the request that failed.
+        :param error: The JSON-RPC error object, with 'code' and 'message'.
+        :return: None
+        """
+        self._send(_ERROR_TEMPLATE % (orjson.dumps(request_id), orjson.dumps(error)))
+
+    def _send(self, payload: bytes) -> None:
+        """
+        Write one encoded, newline-terminated message to stdout. The bytes go
+        straight to the file descriptor, bypassing Python's buffered writer,
+        so a message costs a single write system call in the common case.
+        Only the event loop thread sends, and it does not yield while writing,
+        so messages never interleave.
+
+        :param payload: The JSON line to send.
+        :return: None
+        """
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Sending response: %s",
+                payload[:LOG_PREVIEW_SIZE].decode('utf-8', 'replace').rstrip()
+            )
+        view = memoryview(payload)
+        while view:
+            try:
+                written = os.write(self._stdout_fd, view)
+            except BlockingIOError:
+                # The parent process left stdout non-blocking; wait until it
+                # can take more
+                select.select([], [self._stdout_fd], [])
+                continue
+            view = view[written:]
+
+    def _prewarm(self) -> None:
+        """
+        Take the one-off connection setup out of the first transcript fetch.
+        Resolves and opens a TLS connection to YouTube in the shared session's
+        pool and, for the yt-dlp backend, has a worker thread create its
+        extractor. The connection is tried once, without the session's
+        retries, and failures are only logged at DEBUG; the first request
+        will simply pay the cost.
+
+        :return: None
+        """
+        if TRANSCRIPT_BACKEND == 'ytdlp':
+            self._pool.submit(self._get_ytdlp_extractor)
+
+        url = 'https://www.youtube.com/'
+        try:
+            # Straight through the adapter's pool manager, so the connection
+            # lands in the session's pool but is not retried
+            self._http.get_adapter(url).poolmanager.urlopen(
+                'HEAD', url, retries=False, redirect=False, timeout=5
+            )
+            logger.debug("Connection to YouTube warmed up")
+        except Exception as e:
+            logger.debug("Could not warm up connection to YouTube: %s", e)
 
     def run(self) -> None:
         """
-        Start the server, reading lines from stdin and passing them to 
-        handle_message.
+        Start the server, reading newline-delimited messages from stdin and
+        passing them to handle_message.
         """
-        # Ensure unbuffered I/O
-        sys.stdout.reconfigure(line_buffering=True)
+        # Responses are written unbuffered by _send; keep log lines prompt too
+        _real_stdout.flush()
         sys.stderr.reconfigure(line_buffering=True)
 
-        logging.info("Starting YouTube Transcript Server")
-        
-        for line in sys.stdin:
-            self.handle_message(line.strip())
+        logger.info("Starting YouTube Transcript Server")
+        logger.debug("Python Path: %s", sys.path)
+
+        # Warm up in the background while the client is still initializing
+        threading.Thread(
+            target=self._prewarm, name='transcript-prewarm', daemon=True
+        ).start()
+
+        try:
+            asyncio.run(self._run())
+        finally:
+            self._pool.shutdown(wait=False)
+
+    def _read_stdin(self, loop: asyncio.AbstractEventLoop, lines: asyncio.Queue) -> None:
+        """
+        Read stdin line by line on a background thread and hand each line to
+        the event loop. Blocking reads work for pipes, regular files and
+        terminals on every platform, and lines of any length are read whole.
+
+        :param loop: Event loop running the server.
+        :param lines: Queue receiving the lines, followed by b'' at EOF.
+        :return: None
+        """
+        for line in iter(sys.stdin.buffer.readline, b''):
+            loop.call_soon_threadsafe(lines.put_nowait, line)
+        loop.call_soon_threadsafe(lines.put_nowait, b'')
+
+    async def _run(self) -> None:
+        """
+        Read messages from stdin until EOF, handling each one in its own task
+        so that slow requests do not hold up the ones behind them.
+        """
+        loop = asyncio.get_running_loop()
+        lines = asyncio.Queue()
+        threading.Thread(
+            target=self._read_stdin, args=(loop, lines), name='stdin-reader', daemon=True
+        ).start()
+
+        self._rate_limiter = AdaptiveRateLimiter()
+        refill = asyncio.create_task(self._rate_limiter.refill())
+
+        # Keep references to in-flight tasks so they are not garbage collected
+        pending = set()
+
+        while True:
+            line = await lines.get()
+            if not line:
+                break
+
+            # The line is handed over with its terminator, which the JSON
+            # parser skips as whitespace; only blank lines are dropped
+            if line.isspace():
+                continue
+
+            task = asyncio.create_task(self.handle_message(line))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+
+        # Let in-flight requests finish writing their responses
+        if pending:
+            await asyncio.gather(*pending)
+        refill.cancel()
+
+
+def _find_caption_url(info: Dict[str, Any], languages: Tuple[str, ...]) -> Optional[str]:
+    """
+    Pick the json3 caption track to read from a yt-dlp info dict. Like
+    youtube_transcript_api, languages are tried in order and, for each one,
+    manual subtitles are preferred over automatic captions.
+
+    :param info: The video info returned by YoutubeDL.extract_info.
+    :param languages: Language codes to try, in order of preference.
+    :return: The URL of the caption track, or None if there is none.
+    """
+    for language in languages:
+        for tracks in (info.get('subtitles'), info.get('automatic_captions')):
+            for track in (tracks or {}).get(language, ()):
+                if track.get('ext') == 'json3':
+                    return track['url']
+    return None
+
+
+def _parse_json_with_orjson(response: requests.Response, **kwargs) -> None:
+    """
+    Response hook that makes ``response.json()`` parse with orjson. It is
+    registered on the server's own session only, so youtube_transcript_api
+    and the yt-dlp caption download get the faster parser while other code
+    in the process that uses requests is left alone.
+
+    The body is parsed straight from bytes as UTF-8, which is what YouTube
+    sends. orjson is stricter than the json module: integers wider than 64
+    bits and the NaN/Infinity literals are rejected, neither of which
+    YouTube's payloads contain. Errors are raised as requests'
+    JSONDecodeError, just like ``Response.json()`` does.
+
+    :param response: Response received by the session.
+    :return: None
+    """
+    def parse(**kwargs) -> Any:
+        try:
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError as e:
+            raise requests.exceptions.JSONDecodeError(e.msg, e.doc, e.pos)
+
+    response.json = parse
 
 
 def main() -> None: